@@ -6,12 +6,15 @@ Chapter 1 pages are bespoke and already present in `frontend/`.
 from __future__ import annotations
 
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from html import unescape
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 try:
     from stego import encode_chapter_payload, is_available as stego_is_available
@@ -21,6 +24,7 @@ except Exception:  # pragma: no cover - fallback when stego module missing
     def stego_is_available() -> bool:  # type: ignore[return-value]
         return False
 
+from jsonio import dumps as json_dumps
 from soulcode import build_bundle, write_bundle
 
 
@@ -30,6 +34,11 @@ FLAGS_MAP: Dict[str, Dict[str, str]] = {
     "Garden": {"G": "active", "R": "latent", "B": "latent"},
     "Kira": {"B": "active", "R": "latent", "G": "latent"},
 }
+GLYPH_BASES: Dict[str, str] = {
+    "Limnus": "⟡R",
+    "Garden": "⟢G",
+    "Kira": "⟣B",
+}
 CANONICAL_SCROLLS: Dict[str, List[str]] = {
     "Limnus": [
         "Echo-Community-Toolkit/echo-hilbert-chronicle.html",
@@ -48,6 +57,7 @@ PARAGRAPH_RE = re.compile(r"<p[^>]*>(.*?)</p>", re.IGNORECASE | re.DOTALL)
 TAG_RE = re.compile(r"<[^>]+>")
 MAX_EXCERPT_LENGTH = 420
 SOULCODE_SCRIPT_RE = re.compile(r'<script id="soulcode-state"[^>]*>.*?</script>', re.DOTALL)
+PLACEHOLDER_RE = re.compile(r"\{\{(chapter_number|narrator|body|flags|glyphs_line)\}\}")
 
 
 @dataclass(frozen=True)
@@ -62,6 +72,7 @@ def ts_now() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+@lru_cache(maxsize=None)
 def read_template(root: Path, narrator: str) -> str:
     tpath = root / "markdown_templates" / f"{narrator.lower()}_template.md"
     return tpath.read_text(encoding="utf-8")
@@ -85,11 +96,7 @@ def base_voice_statement(narrator: str, chapter: int) -> str:
 
 
 def glyphs_for(narrator: str, chapter: int) -> List[str]:
-    base = {
-        "Limnus": "⟡R",
-        "Garden": "⟢G",
-        "Kira": "⟣B",
-    }[narrator]
+    base = GLYPH_BASES[narrator]
     # Deterministic sequence of 3 glyphs per chapter
     return [f"{base}{chapter:02d}-{i}" for i in range(1, 4)]
 
@@ -212,16 +219,14 @@ def fill_placeholders(
     glyphs: List[str],
     body_md: str,
 ) -> str:
-    flags_line = f"R {flags['R']}, G {flags['G']}, B {flags['B']}"
-    glyphs_line = "Glyphs: " + " · ".join(glyphs)
-    out = (
-        tpl.replace("{{chapter_number}}", f"{chapter}")
-        .replace("{{narrator}}", narrator)
-        .replace("{{body}}", body_md)
-        .replace("{{flags}}", flags_line)
-        .replace("{{glyphs_line}}", glyphs_line)
-    )
-    return out
+    subs = {
+        "chapter_number": f"{chapter}",
+        "narrator": narrator,
+        "body": body_md,
+        "flags": f"R {flags['R']}, G {flags['G']}, B {flags['B']}",
+        "glyphs_line": "Glyphs: " + " · ".join(glyphs),
+    }
+    return PLACEHOLDER_RE.sub(lambda m: subs[m.group(1)], tpl)
 
 
 def render_markdown_min(md: str) -> str:
@@ -237,19 +242,21 @@ def render_markdown_min(md: str) -> str:
 
     for raw in lines:
         line = raw.rstrip()
-        if not line.strip():
+        if not line:
             flush_paragraph()
             continue
-        if line.startswith("## "):
+        # Dispatch on the first character so plain paragraph lines skip the probes.
+        first = line[0]
+        if first == "#" and line.startswith("## "):
             flush_paragraph()
             html_lines.append(f"<h2>{line[3:].strip()}</h2>")
-        elif line.startswith("[Flags:") and line.endswith("]"):
+        elif first == "[" and line.startswith("[Flags:") and line.endswith("]"):
             flush_paragraph()
             html_lines.append(f"<div class=\"flags\">{line}</div>")
-        elif line.lower().startswith("glyphs:"):
+        elif first in "Gg" and line[:7].lower() == "glyphs:":
             flush_paragraph()
             html_lines.append(f"<div class=\"glyphs\">{line}</div>")
-        elif line.startswith(">"):
+        elif first == ">":
             flush_paragraph()
             html_lines.append(f"<blockquote>{line.lstrip('> ').strip()}</blockquote>")
         else:
@@ -287,8 +294,8 @@ def wrap_html(narrator: str, chapter: int, body_html: str) -> str:
 
 
 def write_text(path: Path, text: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
+    # Callers create the parent directory once up front.
+    path.write_bytes(text.encode("utf-8"))
 
 
 def try_write_yaml(path: Path, data) -> bool:
@@ -296,24 +303,46 @@ def try_write_yaml(path: Path, data) -> bool:
         import yaml  # type: ignore
     except Exception:
         return False
+    try:
+        from yaml import CSafeDumper as Dumper  # type: ignore
+    except ImportError:  # pragma: no cover - libyaml not compiled in
+        from yaml import SafeDumper as Dumper  # type: ignore
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
+    text = yaml.dump(data, Dumper=Dumper, sort_keys=False, allow_unicode=True)
+    path.write_bytes(text.encode("utf-8"))
     return True
 
 
-def main() -> None:
-    root = Path(__file__).resolve().parents[1]
-    frontend = root / "frontend"
-    assets_dir = frontend / "assets"
-    excerpts_by_voice = load_scroll_excerpts(root)
-    chapters_seen = {voice: 0 for voice in VOICES}
+def compact_metadata(chapters: List[dict]) -> dict:
+    # Row-oriented form: each key is listed once, rows follow the same order.
+    keys: List[str] = []
+    for ch in chapters:
+        for key in ch:
+            if key not in keys:
+                keys.append(key)
+    return {"keys": keys, "rows": [[ch.get(key) for key in keys] for ch in chapters]}
 
-    stego_notice_emitted = False
-    stego_error_emitted = False
-
-    metadata: List[dict] = []
 
+@dataclass(frozen=True)
+class ChapterTask:
+    root: Path
+    chapter: int
+    narrator: str
+    rel_file: str
+    excerpt: ScrollExcerpt
+    generated_at: str
+    stego_enabled: bool
+
+
+def plan_chapters(
+    root: Path,
+    excerpts_by_voice: Dict[str, List[ScrollExcerpt]],
+    generated_at: str,
+    stego_enabled: bool,
+) -> List[ChapterTask]:
+    # Excerpt rotation is sequential state, so it is resolved before fan-out.
+    chapters_seen = {voice: 0 for voice in VOICES}
+    tasks: List[ChapterTask] = []
     for i in range(1, 21):
         if i == 1:
             narrator = VOICES[0]  # Limnus
@@ -327,62 +356,98 @@ def main() -> None:
         else:
             narrator = VOICES[(i - 1) % 3]
             rel_file = f"frontend/chapter{i:02d}.html"
-        flags = FLAGS_MAP[narrator]
-        glyphs = glyphs_for(narrator, i)
         excerpt = select_excerpt(narrator, chapters_seen, excerpts_by_voice)
+        tasks.append(
+            ChapterTask(root, i, narrator, rel_file, excerpt, generated_at, stego_enabled)
+        )
+    return tasks
 
-        if i > 3:
-            tpl = read_template(root, narrator)
-            body_md = compose_body_markdown(narrator, i, excerpt, glyphs)
-            filled = fill_placeholders(tpl, narrator, i, flags, glyphs, body_md)
-            body_html = render_markdown_min(filled)
-            html = wrap_html(narrator, i, body_html)
-            write_text(frontend / f"chapter{i:02d}.html", html)
-
-        meta_entry = {
-            "chapter": i,
-            "narrator": narrator,
-            "flags": flags,
-            "glyphs": glyphs,
-            "file": rel_file,
-            "summary": f"{narrator} – Chapter {i:02d} · {excerpt.label}",
-            "timestamp": ts_now(),
-            "provenance": {
-                "scroll": relativize(excerpt.scroll, root),
-                "label": excerpt.label,
-                "paragraph_index": excerpt.paragraph_index,
-                "excerpt": excerpt.text,
-                "glyph_refs": list(glyphs),
-            },
-        }
-
-        stego_rel: str | None = None
-        if stego_is_available() and encode_chapter_payload is not None:
-            try:
-                assets_dir.mkdir(parents=True, exist_ok=True)
-                out_name = f"chapter{i:02d}.png"
-                out_path = assets_dir / out_name
-                encode_chapter_payload(meta_entry, out_path)
-                stego_rel = f"frontend/assets/{out_name}"
-            except Exception as exc:  # pragma: no cover - runtime notice
-                if not stego_error_emitted:
-                    print(f"(Stego) Failed to embed payload: {exc}")
-                    stego_error_emitted = True
-        else:
-            if not stego_notice_emitted:
-                print("(Stego) Pillow not available; skipping PNG embedding.")
-                stego_notice_emitted = True
 
-        if stego_rel:
-            meta_entry["stego_png"] = stego_rel
+def build_chapter(task: ChapterTask) -> Tuple[dict, str | None]:
+    # Runs in a worker process; returns the metadata entry and any stego error.
+    root, i, narrator, excerpt = task.root, task.chapter, task.narrator, task.excerpt
+    frontend = root / "frontend"
+    flags = dict(FLAGS_MAP[narrator])
+    glyphs = glyphs_for(narrator, i)
+
+    if i > 3:
+        tpl = read_template(root, narrator)
+        body_md = compose_body_markdown(narrator, i, excerpt, glyphs)
+        filled = fill_placeholders(tpl, narrator, i, flags, glyphs, body_md)
+        body_html = render_markdown_min(filled)
+        html = wrap_html(narrator, i, body_html)
+        write_text(frontend / f"chapter{i:02d}.html", html)
+
+    meta_entry = {
+        "chapter": i,
+        "narrator": narrator,
+        "flags": flags,
+        "glyphs": glyphs,
+        "file": task.rel_file,
+        "summary": f"{narrator} – Chapter {i:02d} · {excerpt.label}",
+        "timestamp": task.generated_at,
+        "provenance": {
+            "scroll": relativize(excerpt.scroll, root),
+            "label": excerpt.label,
+            "paragraph_index": excerpt.paragraph_index,
+            "excerpt": excerpt.text,
+            "glyph_refs": list(glyphs),
+        },
+    }
+
+    stego_error: str | None = None
+    if task.stego_enabled:
+        try:
+            out_name = f"chapter{i:02d}.png"
+            encode_chapter_payload(meta_entry, frontend / "assets" / out_name)
+            meta_entry["stego_png"] = f"frontend/assets/{out_name}"
+        except Exception as exc:  # pragma: no cover - runtime notice
+            stego_error = str(exc)
+    return meta_entry, stego_error
+
+
+def build_workers() -> int | None:
+    # VMRP_BUILD_WORKERS=1 builds serially; unset uses one process per core.
+    raw = os.environ.get("VMRP_BUILD_WORKERS")
+    try:
+        return max(int(raw), 1) if raw else None
+    except ValueError:
+        return None
+
+
+def main() -> None:
+    root = Path(__file__).resolve().parents[1]
+    frontend = root / "frontend"
+    assets_dir = frontend / "assets"
+    excerpts_by_voice = load_scroll_excerpts(root)
+
+    generated_at = ts_now()
+    stego_enabled = stego_is_available() and encode_chapter_payload is not None
+    frontend.mkdir(parents=True, exist_ok=True)
+    if stego_enabled:
+        assets_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        print("(Stego) Pillow not available; skipping PNG embedding.")
+
+    tasks = plan_chapters(root, excerpts_by_voice, generated_at, stego_enabled)
+    workers = build_workers()
+    if workers == 1:
+        results = [build_chapter(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(build_chapter, tasks))
 
-        metadata.append(meta_entry)
+    metadata: List[dict] = [entry for entry, _ in results]
+    stego_errors = [err for _, err in results if err]
+    if stego_errors:  # pragma: no cover - runtime notice
+        print(f"(Stego) Failed to embed payload: {stego_errors[0]}")
 
     meta_doc = {"chapters": metadata}
     schema_dir = root / "schema"
     schema_dir.mkdir(parents=True, exist_ok=True)
-    (schema_dir / "chapters_metadata.json").write_text(
-        json.dumps(meta_doc, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    (schema_dir / "chapters_metadata.json").write_bytes(json_dumps(meta_doc, indent=True) + b"\n")
+    (schema_dir / "chapters_metadata.compact.json").write_bytes(
+        json_dumps(compact_metadata(metadata)) + b"\n"
     )
     wrote_yaml = try_write_yaml(schema_dir / "chapters_metadata.yaml", meta_doc)
     bundle_generated_at = ts_now()
@@ -390,6 +455,7 @@ def main() -> None:
     write_bundle(schema_dir / "soulcode_bundle.json", soulcode_bundle)
     embed_soulcode_bundle(frontend / "index.html", soulcode_bundle)
     print("Wrote:", schema_dir / "chapters_metadata.json")
+    print("Wrote:", schema_dir / "chapters_metadata.compact.json")
     if wrote_yaml:
         print("Wrote:", schema_dir / "chapters_metadata.yaml")
     else:
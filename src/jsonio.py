@@ -0,0 +1,42 @@
+"""JSON serialisation helpers shared by the generator, stego, and validator.
+
+``orjson`` is used when importable; otherwise the stdlib ``json`` module
+produces equivalent output (UTF-8, compact unless indented).
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # Optional accelerator
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON bytes, indented by two spaces if requested."""
+
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys)
+    return text.encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from ``data``; bytes are parsed without an intermediate str."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+__all__ = ["dumps", "loads"]
@@ -6,26 +6,78 @@ payload and encodes the payload length so we know when to stop during decode.
 
 The module relies on Pillow when available. Callers should check
 ``is_available()`` before attempting to encode/decode, and degrade gracefully if
-Pillow is missing.
+Pillow is missing. When NumPy is importable the bit packing runs as vectorised
+array operations; otherwise a pure-Python pixel loop is used.
 """
 from __future__ import annotations
 
-import json
 import math
+import os
 import struct
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
 
 try:  # Optional dependency
     from PIL import Image
 except ImportError:  # pragma: no cover - handled at runtime
     Image = None  # type: ignore[misc]
 
+from jsonio import dumps as json_dumps, loads as json_loads
+
+try:  # Optional accelerator
+    import numpy as np
+except ImportError:  # pragma: no cover - pure-Python fallback
+    np = None  # type: ignore[assignment]
+
 
 HEADER = b"VMRP\0"
-VERSION = 1
-_META_KEYS_TO_EXCLUDE = {"stego_png"}
+VERSION = 2
+# v1 payloads always carried ``flags``; v2 omits them when implied by the narrator.
+_SUPPORTED_VERSIONS = {1, 2}
+_HEADER_PREFIX = HEADER + bytes([VERSION])
+_LEN_STRUCT = struct.Struct(">I")
+
+# StegoDoc fields in sorted order, so the payload is canonical without sort_keys.
+_PAYLOAD_KEYS = (
+    "chapter",
+    "file",
+    "flags",
+    "glyphs",
+    "narrator",
+    "provenance",
+    "summary",
+    "timestamp",
+)
+_NARRATOR_CHANNELS = {"Limnus": "R", "Garden": "G", "Kira": "B"}
+_STREAM_CHUNK = 1 << 16
+
+# Byte-level lookup tables so the pure-Python path avoids per-bit shifting.
+_BYTE_TO_BITS = tuple(bytes((b >> s) & 1 for s in range(7, -1, -1)) for b in range(256))
+_BITS_TO_BYTE = {bits: b for b, bits in enumerate(_BYTE_TO_BITS)}
+_LSB_TABLE = bytes(b & 1 for b in range(256))
+_CLEAR_LSB_TABLE = bytes(b & 0xFE for b in range(256))
+
+
+def _png_compress_level() -> int:
+    # LSB payloads are noise, so heavier zlib levels cost time without saving space.
+    raw = os.environ.get("VMRP_PNG_COMPRESS", "1")
+    try:
+        level = int(raw)
+    except ValueError:
+        return 1
+    return min(max(level, 0), 9)
+
+
+PNG_COMPRESS_LEVEL = _png_compress_level()
+
+
+def _narrator_flags(narrator: object) -> Dict[str, str] | None:
+    active = _NARRATOR_CHANNELS.get(narrator)  # type: ignore[arg-type]
+    if active is None:
+        return None
+    return {ch: "active" if ch == active else "latent" for ch in ("R", "G", "B")}
 
 
 @dataclass(frozen=True)
@@ -43,10 +95,15 @@ class StegoDoc:
 
     @classmethod
     def from_dict(cls, data: Dict[str, object]) -> "StegoDoc":
+        flags = data.get("flags")
+        if flags is None:
+            flags = _narrator_flags(data["narrator"])
+            if flags is None:
+                raise ValueError("Stego payload has no flags and an unknown narrator")
         return cls(
             chapter=int(data["chapter"]),
             narrator=str(data["narrator"]),
-            flags={k: str(v) for k, v in dict(data["flags"]).items()},
+            flags={k: str(v) for k, v in dict(flags).items()},
             glyphs=tuple(str(g) for g in data["glyphs"]),
             file=str(data["file"]),
             summary=str(data["summary"]),
@@ -80,59 +137,92 @@ def _ensure_available() -> None:
         )
 
 
+def _canonical_stego_doc(chapter_meta: Dict[str, object]) -> Dict[str, object]:
+    doc = {k: chapter_meta[k] for k in _PAYLOAD_KEYS if k in chapter_meta}
+    # Flags implied by the narrator are rebuilt on decode, so skip embedding them.
+    if "flags" in doc and doc["flags"] == _narrator_flags(doc.get("narrator")):
+        del doc["flags"]
+    return doc
+
+
 def _payload_bytes(chapter_meta: Dict[str, object]) -> bytes:
-    doc = {k: v for k, v in chapter_meta.items() if k not in _META_KEYS_TO_EXCLUDE}
-    payload_json = json.dumps(doc, separators=(",", ":"), sort_keys=True)
-    payload_data = payload_json.encode("utf-8")
-    header = HEADER + bytes([VERSION]) + struct.pack(">I", len(payload_data))
-    return header + payload_data
+    doc = _canonical_stego_doc(chapter_meta)
+    payload_data = json_dumps(doc)
+    return _HEADER_PREFIX + _LEN_STRUCT.pack(len(payload_data)) + payload_data
 
 
-def _bits_from_bytes(data: bytes) -> Iterator[int]:
-    for byte in data:
-        for shift in range(7, -1, -1):
-            yield (byte >> shift) & 1
+def _bits_from_bytes(data: bytes) -> bytes:
+    return b"".join(map(_BYTE_TO_BITS.__getitem__, data))
 
 
 def _read_bytes(bit_iter: Iterator[int], count: int) -> bytes:
-    result = bytearray()
-    for _ in range(count):
-        byte = 0
-        for _ in range(8):
-            try:
-                bit = next(bit_iter)
-            except StopIteration as exc:  # pragma: no cover - defensive
-                raise ValueError("Image does not contain enough embedded data") from exc
-            byte = (byte << 1) | bit
-        result.append(byte)
-    return bytes(result)
+    bits = bytes(islice(bit_iter, count * 8))
+    if len(bits) < count * 8:  # pragma: no cover - defensive
+        raise ValueError("Image does not contain enough embedded data")
+    return bytes(_BITS_TO_BYTE[bits[i : i + 8]] for i in range(0, len(bits), 8))
 
 
 def _lsb_bit_stream(img: "Image.Image") -> Iterator[int]:
-    pixels = img.convert("RGB").getdata()
-    for pixel in pixels:
-        yield from read_pixel_bits(pixel)
+    if np is None:
+        yield from img.convert("RGB").tobytes().translate(_LSB_TABLE)
+        return
+    channels = np.asarray(img.convert("RGB"), dtype=np.uint8).reshape(-1)
+    for start in range(0, channels.size, _STREAM_CHUNK):
+        yield from (channels[start : start + _STREAM_CHUNK] & 1).tolist()
 
 
-def _embed_bits(img: "Image.Image", payload: bytes) -> None:
-    bits = list(_bits_from_bytes(payload))
+def _lsb_reader(img: "Image.Image") -> Callable[[int], bytes]:
+    """Return a callable reading the next ``count`` embedded bytes from ``img``."""
+
+    if np is None:
+        bit_iter = _lsb_bit_stream(img)
+        return lambda count: _read_bytes(bit_iter, count)
+
     width, height = img.size
-    pixels = img.load()
-    total_channels = width * height * 3
-    if len(bits) > total_channels:
+    row_channels = width * 3
+    position = 0
+
+    def read(count: int) -> bytes:
+        # Only materialise the rows that hold the requested bits.
+        nonlocal position
+        stop = position + count * 8
+        if stop > row_channels * height:
+            raise ValueError("Image does not contain enough embedded data")
+        first_row = position // row_channels
+        last_row = -(-stop // row_channels)
+        window = np.asarray(img.crop((0, first_row, width, last_row)), dtype=np.uint8)
+        offset = position - first_row * row_channels
+        bits = window.reshape(-1)[offset : offset + count * 8] & 1
+        position = stop
+        return np.packbits(bits).tobytes()
+
+    return read
+
+
+def _embed_bits_bytes(img: "Image.Image", payload: bytes) -> None:
+    # Edit the raw R,G,B,... buffer and write it back in one bulk call. Each
+    # bit occupies its own byte's LSB, so one big-int OR sets them all.
+    bits = _bits_from_bytes(payload)
+    buf = bytearray(img.tobytes())
+    nbits = len(bits)
+    if nbits > len(buf):
         raise ValueError("Base image too small for payload")
-    bit_iter = iter(bits)
-    for y in range(height):
-        for x in range(width):
-            next_bits: list[int] = []
-            for _ in range(3):
-                try:
-                    next_bits.append(next(bit_iter))
-                except StopIteration:
-                    break
-            if not next_bits:
-                return
-            pixels[x, y] = write_pixel_bits(pixels[x, y], tuple(next_bits))
+    cleared = int.from_bytes(buf[:nbits].translate(_CLEAR_LSB_TABLE), "big")
+    buf[:nbits] = (cleared | int.from_bytes(bits, "big")).to_bytes(nbits, "big")
+    img.frombytes(bytes(buf))
+
+
+def _embed_bits(img: "Image.Image", payload: bytes) -> "Image.Image":
+    if np is None:
+        _embed_bits_bytes(img, payload)
+        return img
+    channels = np.array(img, dtype=np.uint8)
+    flat = channels.reshape(-1)
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    if bits.size > flat.size:
+        raise ValueError("Base image too small for payload")
+    flat[: bits.size] = (flat[: bits.size] & 0xFE) | bits
+    return Image.fromarray(channels, "RGB")
 
 
 def _prepare_image(payload: bytes, base_image_path: Path | None) -> "Image.Image":
@@ -156,9 +246,14 @@ def encode_chapter_payload(
     _ensure_available()
     payload = _payload_bytes(chapter_meta)
     image = _prepare_image(payload, base_image)
-    _embed_bits(image, payload)
+    image = _embed_bits(image, payload)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    image.save(output_path, format="PNG")
+    image.save(
+        output_path,
+        format="PNG",
+        compress_level=PNG_COMPRESS_LEVEL,
+        optimize=False,
+    )
     return output_path
 
 
@@ -166,18 +261,20 @@ def decode_chapter_payload(image_path: Path) -> StegoDoc:
     """Decode and return the metadata embedded in ``image_path``."""
 
     _ensure_available()
-    img = Image.open(image_path).convert("RGB")
-    bit_iter = _lsb_bit_stream(img)
-    header_size = len(HEADER) + 1 + 4
-    header = _read_bytes(bit_iter, header_size)
+    img = Image.open(image_path)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    read = _lsb_reader(img)
+    header_size = len(_HEADER_PREFIX) + _LEN_STRUCT.size
+    header = read(header_size)
     if header[: len(HEADER)] != HEADER:
         raise ValueError("Stego header mismatch")
     version = header[len(HEADER)]
-    if version != VERSION:
+    if version not in _SUPPORTED_VERSIONS:
         raise ValueError(f"Unsupported stego version: {version}")
-    payload_len = struct.unpack(">I", header[len(HEADER) + 1 :])[0]
-    payload = _read_bytes(bit_iter, payload_len)
-    data = json.loads(payload.decode("utf-8"))
+    payload_len = _LEN_STRUCT.unpack(header[len(_HEADER_PREFIX) :])[0]
+    payload = read(payload_len)
+    data = json_loads(payload)
     return StegoDoc.from_dict(data)
 
 
@@ -15,22 +15,20 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 try:
-    from stego import (
-        decode_chapter_payload,
-        extract_flags as stego_extract_flags,
-        is_available as stego_is_available,
-    )
+    from stego import decode_chapter_payload, is_available as stego_is_available
 except Exception:  # pragma: no cover - fallback when Pillow missing
     decode_chapter_payload = None  # type: ignore[assignment]
-    stego_extract_flags = None  # type: ignore[assignment]
 
     def stego_is_available() -> bool:  # type: ignore[return-value]
         return False
 
+from jsonio import dumps as json_dumps, loads as json_loads
 from soulcode import BUNDLE_TYPE, verify_bundle
 
 
-FLAG_RE = re.compile(r"\[\s*Flags:\s*([^\]]+)\]", re.IGNORECASE)
+FLAG_BYTES_RE = re.compile(rb"\[\s*Flags:\s*([^\]]+)\]", re.IGNORECASE)
+FLAG_SCAN_BYTES = 8192
+FLAG_CACHE_REL = "schema/.validator_cache.json"
 SOULCODE_SCRIPT_RE = re.compile(r'<script id="soulcode-state"[^>]*>(.*?)</script>', re.DOTALL)
 
 
@@ -38,14 +36,14 @@ def load_metadata(root: Path) -> dict:
     meta_path = root / "schema" / "chapters_metadata.json"
     if not meta_path.exists():
         raise SystemExit(f"Missing metadata file: {meta_path}")
-    return json.loads(meta_path.read_text(encoding="utf-8"))
+    return json_loads(meta_path.read_bytes())
 
 
 def load_schema(root: Path) -> dict:
     schema_path = root / "schema" / "narrative_schema.json"
     if not schema_path.exists():
         raise SystemExit(f"Missing schema file: {schema_path}")
-    return json.loads(schema_path.read_text(encoding="utf-8"))
+    return json_loads(schema_path.read_bytes())
 
 
 def basic_validate_against_schema(meta: dict, schema: dict) -> List[str]:
@@ -88,12 +86,16 @@ def basic_validate_against_schema(meta: dict, schema: dict) -> List[str]:
 
 def check_rotation(chapters: List[dict]) -> List[str]:
     errors: List[str] = []
-    voices = [ch.get("narrator") for ch in chapters]
-    for a, b in zip(voices, voices[1:]):
-        if a == b:
+    counts: Counter = Counter()
+    prev = None
+    repeated = False
+    for idx, ch in enumerate(chapters):
+        voice = ch.get("narrator")
+        if idx and voice == prev and not repeated:
             errors.append("Narrator repetition detected (no back-to-back allowed)")
-            break
-    counts = Counter(voices)
+            repeated = True
+        counts[voice] += 1
+        prev = voice
     for name in ["Limnus", "Garden", "Kira"]:
         if counts[name] < 6:
             errors.append(f"Narrator {name} appears fewer than 6 times ({counts[name]})")
@@ -112,15 +114,55 @@ def parse_flags_text(flags_text: str) -> Dict[str, str]:
 
 
 def extract_flags_from_html(path: Path) -> Optional[Dict[str, str]]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    m = FLAG_RE.search(text)
+    with path.open("rb") as f:
+        data = f.read(FLAG_SCAN_BYTES)
+        m = FLAG_BYTES_RE.search(data)
+        if not m:
+            # Rescan with the remainder so a marker straddling the boundary is found.
+            data += f.read()
+            m = FLAG_BYTES_RE.search(data)
     if not m:
         return None
-    return parse_flags_text(m.group(1))
+    return parse_flags_text(m.group(1).decode("utf-8", errors="ignore"))
+
+
+def load_flag_cache(cache_path: Path) -> Dict[str, dict]:
+    try:
+        data = json_loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_flag_cache(cache_path: Path, cache: Dict[str, dict]) -> None:
+    try:
+        cache_path.write_bytes(json_dumps(cache, indent=True, sort_keys=True) + b"\n")
+    except OSError:  # pragma: no cover - read-only checkout
+        pass
+
+
+def cached_flags_from_html(
+    path: Path, rel: str, cache: Dict[str, dict]
+) -> Tuple[Optional[Dict[str, str]], bool]:
+    # Returns (flags, cache_updated); entries are keyed on mtime and size.
+    st = path.stat()
+    entry = cache.get(rel)
+    if (
+        isinstance(entry, dict)
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and entry.get("size") == st.st_size
+    ):
+        return entry.get("flags"), False
+    flags = extract_flags_from_html(path)
+    cache[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "flags": flags}
+    return flags, True
 
 
 def check_files_and_flags(root: Path, chapters: List[dict]) -> List[str]:
     errors: List[str] = []
+    cache_path = root / FLAG_CACHE_REL
+    cache = load_flag_cache(cache_path)
+    dirty = False
     for ch in chapters:
         ch_no = ch.get("chapter")
         rel = ch.get("file")
@@ -132,7 +174,8 @@ def check_files_and_flags(root: Path, chapters: List[dict]) -> List[str]:
         if not path.exists():
             errors.append(f"Chapter {ch_no}: missing file {rel}")
             continue
-        flags_in_html = extract_flags_from_html(path)
+        flags_in_html, updated = cached_flags_from_html(path, rel, cache)
+        dirty = dirty or updated
         if not flags_in_html:
             errors.append(f"Chapter {ch_no}: Flags not found in HTML")
             continue
@@ -142,6 +185,8 @@ def check_files_and_flags(root: Path, chapters: List[dict]) -> List[str]:
                 errors.append(
                     f"Chapter {ch_no}: flag mismatch for {k} (meta={flags_meta.get(k)} html={flags_in_html.get(k)})"
                 )
+    if dirty:
+        save_flag_cache(cache_path, cache)
     return errors
 
 
@@ -166,18 +211,14 @@ def check_stego_payloads(root: Path, chapters: List[dict]) -> List[str]:
         except Exception as exc:
             errors.append(f"Chapter {ch.get('chapter')}: failed to decode stego PNG ({exc})")
             continue
-        if stego_extract_flags is not None:
-            try:
-                decoded_flags = stego_extract_flags(path)
-            except Exception as exc:
-                errors.append(f"Chapter {ch.get('chapter')}: failed to extract flags from stego PNG ({exc})")
-            else:
-                for key in ("R", "G", "B"):
-                    if decoded_flags.get(key) != ch.get("flags", {}).get(key):
-                        errors.append(
-                            f"Chapter {ch.get('chapter')}: stego flag mismatch for {key} "
-                            f"(payload={decoded_flags.get(key)} metadata={ch.get('flags', {}).get(key)})"
-                        )
+        # Flags come from the payload already decoded above; no second decode.
+        decoded_flags = payload["flags"]
+        for key in ("R", "G", "B"):
+            if decoded_flags.get(key) != ch.get("flags", {}).get(key):
+                errors.append(
+                    f"Chapter {ch.get('chapter')}: stego flag mismatch for {key} "
+                    f"(payload={decoded_flags.get(key)} metadata={ch.get('flags', {}).get(key)})"
+                )
         expected = {k: v for k, v in ch.items() if k != "stego_png"}
         if payload != expected:
             errors.append(
@@ -228,7 +269,7 @@ def check_soulcode_bundle(root: Path, chapters: List[dict]) -> Tuple[List[str],
     if not bundle_path.exists():
         return ([f"Missing soulcode bundle: {bundle_path}"], None)
     try:
-        bundle = json.loads(bundle_path.read_text(encoding="utf-8"))
+        bundle = json_loads(bundle_path.read_bytes())
     except json.JSONDecodeError as exc:
         return ([f"Soulcode bundle is not valid JSON ({exc})"], None)
 